@@ -57,6 +57,12 @@ EFFECTS = {
     }
 }
 
+# (param name, default) pairs per effect, precomputed for create_pedalboard
+_EFFECT_DEFAULTS = {
+    name: tuple((p["name"], p["default"]) for p in eff["params"])
+    for name, eff in EFFECTS.items()
+}
+
 def get_available_effects():
     """
     Return a list of effect names for populating UI dropdowns.
@@ -83,9 +89,6 @@ def create_pedalboard(effect_name, **kwargs):
 
     cls = eff["class"]
     # Build parameter dict, using defaults where not provided
-    params = {}
-    for cfg in eff["params"]:
-        param_name = cfg["name"]
-        params[param_name] = kwargs.get(param_name, cfg["default"])
+    params = {name: kwargs.get(name, default) for name, default in _EFFECT_DEFAULTS[effect_name]}
 
     return Pedalboard([cls(**params)])
@@ -1,8 +1,9 @@
-from pyo import *
+from pyo import Server, SfPlayer, Freeverb
 
 # Initialize the Pyo server
 def reverb_test():
-    s = Server().boot()
+    # Playback only, so no duplex input; 1024 frames at 44.1 kHz is ~23 ms of latency
+    s = Server(sr=44100, nchnls=2, buffersize=1024, duplex=0, audio='portaudio').boot()
     track = "C:/Users/Atlas/Music/converted_audio.wav"
 
     snd = SfPlayer(track, speed=1, loop=True)
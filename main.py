@@ -1,6 +1,8 @@
 import sys
 import os
 import asyncio
+import functools
+import math
 from os.path import basename
 
 import soundfile as sf
@@ -14,10 +16,19 @@ from PyQt6.QtWidgets import (
     QDialog, QLineEdit, QMessageBox, QProgressDialog,
     QColorDialog
 )
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
+from PyQt6.QtCore import (
+    Qt, QTimer, QThread, pyqtSignal, pyqtSlot,
+    QObject, QRunnable, QThreadPool
+)
 from pedalboard import Pedalboard
-from effects import get_available_effects, get_param_configs
-from splitter import convert_audio, spleeter_split, demucs_split
+from effects import EFFECTS, get_available_effects, get_param_configs
+
+
+# Frames per audio callback; fixed so every callback sees the same block size
+BLOCKSIZE = 512
+# Every track is decoded to this rate (the splitters' output rate), so one
+# shared stream can play any mix of files at the right speed and pitch
+PLAYBACK_RATE = 44100
 
 
 def format_time(seconds: float) -> str:
@@ -25,6 +36,54 @@ def format_time(seconds: float) -> str:
     return f"{m:02d}:{s:02d}"
 
 
+def _aligned(shape, dtype=np.float32, align=64):
+    """Return an uninitialised C-contiguous array whose data starts on an `align`-byte boundary."""
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    buf = np.empty(nbytes + align, dtype=np.uint8)
+    offset = -buf.ctypes.data % align
+    return buf[offset:offset + nbytes].view(dtype).reshape(shape)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_pcm(path: str, mtime: float):
+    """Decode an audio file once; keyed on mtime so edited files are re-read."""
+    # Decode straight into one float32 buffer sized from the header; float32
+    # matches the output stream, halving memory traffic versus float64
+    with sf.SoundFile(path) as f:
+        data = _aligned((f.frames, f.channels))
+        # read() returns a prefix view if the decoder yields fewer frames
+        data = f.read(out=data)
+        sr = f.samplerate
+    if data.shape[1] > 2:
+        # Fold centre/surround/LFE into both sides; halved so the sum stays in range
+        stereo = _aligned((len(data), 2))
+        np.add(data[:, :2], data[:, 2:].mean(axis=1, keepdims=True), out=stereo)
+        np.multiply(stereo, np.float32(0.5), out=stereo)
+        data = stereo
+    if sr != PLAYBACK_RATE:
+        # Resampled once here, then cached like the rest of the decode
+        from scipy.signal import resample_poly
+        g = math.gcd(sr, PLAYBACK_RATE)
+        resampled = resample_poly(data, PLAYBACK_RATE // g, sr // g, axis=0)
+        data = _aligned(resampled.shape)
+        np.copyto(data, resampled)
+        sr = PLAYBACK_RATE
+    if data.shape[1] == 1:
+        # Expand mono once here so playback and export always see stereo frames
+        stereo = _aligned((len(data), 2))
+        np.copyto(stereo, data)
+        data = stereo
+    # Shared between tracks through the cache, so never modify in place
+    data.flags.writeable = False
+    return data, sr
+
+
+def read_audio(filename: str):
+    """Return (data, sample_rate) for a file, reusing previously decoded PCM."""
+    path = os.path.abspath(filename)
+    return _load_pcm(path, os.path.getmtime(path))
+
+
 class TrackEffectWidget(QWidget):
     def __init__(self, parent_track):
         super().__init__()
@@ -32,6 +91,7 @@ class TrackEffectWidget(QWidget):
         self.locked = False
         self.effect_name = None
         self.param_sliders = {}
+        self.param_values = {}
 
         self.main_layout = QVBoxLayout()
         self.header_layout = QHBoxLayout()
@@ -61,25 +121,34 @@ class TrackEffectWidget(QWidget):
         self.setLayout(self.main_layout)
         self.on_effect_change(self.name_combo.currentText())
 
+    @pyqtSlot(str)
     def on_effect_change(self, name):
         while self.params_form.count():
             item = self.params_form.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
         self.param_sliders.clear()
+        self.param_values.clear()
 
         for cfg in get_param_configs(name):
             slider = QSlider(Qt.Orientation.Horizontal)
             slider.setRange(0, 100)
             default_norm = (cfg['default'] - cfg['min']) / (cfg['max'] - cfg['min'])
             slider.setValue(int(default_norm * 100))
-            slider.sliderReleased.connect(self.parent_track.apply_effect)
+            self.on_param_change(cfg, slider.value())
+            slider.valueChanged.connect(functools.partial(self.on_param_change, cfg))
+            slider.sliderReleased.connect(self.parent_track.apply_debounce.start)
             self.params_form.addRow(cfg['name'].replace('_', ' ').title(), slider)
             self.param_sliders[cfg['name']] = (slider, cfg)
 
         self.effect_name = name
-        self.parent_track.apply_effect()
+        self.parent_track.apply_debounce.start()
+
+    def on_param_change(self, cfg, value):
+        # Keep the real parameter value ready so apply_effect doesn't query every slider
+        self.param_values[cfg['name']] = cfg['min'] + (cfg['max'] - cfg['min']) * value / 100
 
+    @pyqtSlot()
     def toggle_lock(self):
         self.locked = not self.locked
 
@@ -93,17 +162,23 @@ class TrackEffectWidget(QWidget):
             if lbl:
                 lbl.setVisible(not self.locked)
 
-        self.parent_track.apply_effect()
+        self.parent_track.apply_debounce.start()
 
 
+    @pyqtSlot()
     def on_remove(self):
         self.setParent(None)
         self.parent_track.effect_widgets.remove(self)
-        self.parent_track.apply_effect()
+        self.parent_track.apply_debounce.start()
 
 
 class Track(QWidget):
+    length_changed = pyqtSignal(int)
     instances = []
+    # Whether any track is soloed; recomputed on the GUI thread, read by callbacks
+    _any_solo = False
+    # Folder the last audio file was picked from, shared by every file dialog
+    _last_dir = ""
 
     def __init__(self, track_number, parent_app=None):
         super().__init__()
@@ -112,20 +187,35 @@ class Track(QWidget):
         self.original_audio_data = None
         self.audio_data = None
         self.sample_rate = None
-        self.stream = None
-        self.is_playing = False
         self.position = 0
         self.duration = 0.0
+        self._last_sec = -1
+        self._time_strs = []
         self.muted = False
         self.soloed = False
         self.track_color = None
+        self._volume = np.float32(0.5)
+        # Gain the mix callback last played at; it ramps towards _volume
+        self._applied_volume = self._volume
+        self._mute_or_silenced = False
 
         Track.instances.append(self)
         self.effect_widgets = []
+        self._loader = None
+        # (source buffer, chain) of the last applied render, to skip repeats
+        self._last_applied = (None, None)
+        self.render_thread = EffectRenderThread()
+        self.render_thread.rendered.connect(self.on_rendered)
+        self.render_thread.failed.connect(self.on_render_failed)
+        # Coalesces bursts of effect edits into one render
+        self.apply_debounce = QTimer(self)
+        self.apply_debounce.setSingleShot(True)
+        self.apply_debounce.setInterval(50)
+        self.apply_debounce.timeout.connect(self.apply_effect)
         self.init_ui()
 
     def init_ui(self):
-        self.setStyleSheet("background-color: #303030; color: white;")
+        # Colours come from the app stylesheet; AudioApp then sets the track colour once
         layout = QVBoxLayout()
         layout.setSpacing(10)
 
@@ -147,10 +237,10 @@ class Track(QWidget):
         # Mute/Solo
         ctrl_layout = QHBoxLayout()
         self.mute_checkbox = QCheckBox('Mute')
-        self.mute_checkbox.stateChanged.connect(lambda s: setattr(self, 'muted', bool(s)))
+        self.mute_checkbox.stateChanged.connect(self._on_mute)
         ctrl_layout.addWidget(self.mute_checkbox)
         self.solo_checkbox = QCheckBox('Solo')
-        self.solo_checkbox.stateChanged.connect(lambda s: setattr(self, 'soloed', bool(s)))
+        self.solo_checkbox.stateChanged.connect(self._on_solo)
         ctrl_layout.addWidget(self.solo_checkbox)
         layout.addLayout(ctrl_layout)
 
@@ -160,6 +250,7 @@ class Track(QWidget):
         self.volume_slider = QSlider(Qt.Orientation.Horizontal)
         self.volume_slider.setRange(0, 100)
         self.volume_slider.setValue(50)
+        self.volume_slider.valueChanged.connect(self.update_volume)
         vol_layout.addWidget(self.volume_slider)
         layout.addLayout(vol_layout)
 
@@ -176,12 +267,9 @@ class Track(QWidget):
         self.add_effect_button.clicked.connect(self.add_effect)
         layout.addWidget(self.add_effect_button)
 
-        # Playback timer
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_time)
-
         self.setLayout(layout)
 
+    @pyqtSlot()
     def choose_color(self):
         color = QColorDialog.getColor(parent=self, title="Select Track Color")
         if color.isValid():
@@ -193,115 +281,296 @@ class Track(QWidget):
                 f"background-color: {self.track_color}; color: {text_color};"
             )
 
+    @classmethod
+    def ask_audio_file(cls, parent, caption):
+        """Ask for an audio file, starting in the folder the previous one came from."""
+        fname, _ = QFileDialog.getOpenFileName(parent, caption, cls._last_dir, "Audio Files (*.wav *.mp3 *.flac)")
+        if fname:
+            Track._last_dir = os.path.dirname(fname)
+        return fname
+
+    @pyqtSlot()
     def import_audio(self):
-        fname, _ = QFileDialog.getOpenFileName(self, "Open Audio File", "", "Audio Files (*.wav *.mp3 *.flac)")
+        fname = Track.ask_audio_file(self, "Open Audio File")
         if fname:
-            self.load_audio(fname)
+            # Decode on the thread pool so a long file doesn't freeze the window
+            self.label.setText(f"Track {self.track_number}: Loading...")
+            self._loader = AudioLoader(fname)
+            self._loader.signals.loaded.connect(self.on_loaded)
+            self._loader.signals.failed.connect(self.on_load_failed)
+            QThreadPool.globalInstance().start(self._loader)
+            try:
+                # Header-only read, so the length shows before the decode finishes
+                info = sf.info(fname)
+                self.time_label.setText(f"00:00 / {format_time(info.frames / info.samplerate)}")
+            except RuntimeError:
+                pass
+
+    @pyqtSlot(str, object, int)
+    def on_loaded(self, filename, data, sr):
+        # Ignore a load that was overtaken by a newer import
+        if self._loader is not None and filename == self._loader.path:
+            self._loader = None
+            self.set_audio(filename, data, sr)
+
+    @pyqtSlot(str, str)
+    def on_load_failed(self, filename, err_msg):
+        if self._loader is not None and filename == self._loader.path:
+            self._loader = None
+            self.label.setText(f"Track {self.track_number}: No file loaded")
+            QMessageBox.critical(self, 'Error', err_msg)
 
     def load_audio(self, filename: str):
-        data, sr = sf.read(filename, always_2d=True)
-        self.original_audio_data = data
+        # A direct load supersedes any import still decoding in the background
+        self._loader = None
+        self.set_audio(filename, *read_audio(filename))
+
+    def set_audio(self, filename, data, sr):
+        # The PCM cache hands back the same array for a reload; keep the current
+        # (possibly rendered) buffer then, since apply_effect skips an unchanged chain
+        if data is not self.original_audio_data:
+            self.original_audio_data = data
+            self.audio_data = data
         self.sample_rate = sr
         self.apply_effect()
-        self.duration = len(self.audio_data) / self.sample_rate
+        self.duration = len(data) / self.sample_rate
         total = format_time(self.duration)
-        self.time_label.setText(f"00:00 / {total}")
+        # One label string per second of audio, built once instead of every tick
+        self._time_strs = [f"{format_time(sec)} / {total}" for sec in range(int(self.duration) + 1)]
+        self.time_label.setText(self._time_strs[0])
+        self._last_sec = 0
         self.label.setText(f"Track {self.track_number}: {os.path.basename(filename)}")
+        self.length_changed.emit(len(data))
 
-    def audio_callback(self, outdata, frames, time, status):
-        if status:
-            print(status)
-        vol = self.volume_slider.value() / 100
-        any_solo = any(t.soloed for t in Track.instances)
-        if self.audio_data is None:
-            out = np.zeros((frames, 2))
-        else:
-            start = self.position
-            end = start + frames
-            if end <= len(self.audio_data):
-                chunk = self.audio_data[start:end]
-            else:
-                chunk = self.audio_data[start:]
-                pad = np.zeros((frames - chunk.shape[0], self.audio_data.shape[1]))
-                chunk = np.vstack((chunk, pad))
-            self.position = min(end, len(self.audio_data))
-            out = chunk * vol
-            if self.muted or (any_solo and not self.soloed):
-                out = np.zeros_like(out)
-        outdata[:] = out
-
-    def play(self):
-        if not self.is_playing and self.audio_data is not None:
-            self.stream = sd.OutputStream(samplerate=self.sample_rate,
-                                          channels=self.audio_data.shape[1],
-                                          callback=self.audio_callback)
-            self.stream.start()
-            self.timer.start(100)
-            self.is_playing = True
+    @pyqtSlot(int)
+    def _on_mute(self, state):
+        self.muted = bool(state)
+        self._recompute_gate()
 
-    def stop(self):
-        if self.stream:
-            self.stream.stop()
-            self.stream.close()
-            self.stream = None
-        self.timer.stop()
-        self.is_playing = False
+    @pyqtSlot(int)
+    def _on_solo(self, state):
+        self.soloed = bool(state)
+        Track._recompute_any_solo()
+
+    @classmethod
+    def _recompute_any_solo(cls):
+        cls._any_solo = any(t.soloed for t in cls.instances)
+        # Soloing one track silences the others, so every gate may change
+        for t in cls.instances:
+            t._recompute_gate()
+
+    def _recompute_gate(self):
+        self._mute_or_silenced = self.muted or (Track._any_solo and not self.soloed)
+
+    @pyqtSlot(int)
+    def update_volume(self, value):
+        # Read by the mix callback; a plain float assign is atomic under the GIL
+        self._volume = np.float32(value * 0.01)
 
     def update_time(self):
+        if self.sample_rate is None:
+            return
         current = min(self.position / self.sample_rate, self.duration)
-        total = self.duration
-        self.time_label.setText(f"{format_time(current)} / {format_time(total)}")
+        # The label only shows whole seconds, so skip ticks that wouldn't change it
+        sec = int(current)
+        if sec == self._last_sec:
+            return
+        self._last_sec = sec
+        self.time_label.setText(self._time_strs[sec])
 
+    @pyqtSlot()
     def add_effect(self):
         widget = TrackEffectWidget(self)
         self.effect_widgets.append(widget)
         self.effects_container.addWidget(widget)
 
+    @pyqtSlot()
     def apply_effect(self):
         if self.original_audio_data is None:
             return
-        # build pedalboard chain
+        # snapshot the chain; the render thread must not see later slider moves
         chain = []
         for w in self.effect_widgets:
             if w.effect_name and w.effect_name != 'None':
-                params = {}
-                for name, (slider, cfg) in w.param_sliders.items():
-                    norm = slider.value() / slider.maximum()
-                    params[name] = cfg['min'] + (cfg['max'] - cfg['min']) * norm
-                # instantiate effect class
-                eff_cfg = get_param_configs(w.effect_name)
-                from effects import EFFECTS
-                cls = EFFECTS[w.effect_name]['class']
-                chain.append(cls(**params))
-        self.board = Pedalboard(chain)
-        self.audio_data = self.board(self.original_audio_data.copy(), self.sample_rate)
+                chain.append((w.effect_name, dict(w.param_values)))
+        # Lock toggles and releases without a change would re-render the same result
+        source, last_chain = self._last_applied
+        if source is self.original_audio_data and chain == last_chain:
+            return
+        self._last_applied = (self.original_audio_data, chain)
+        if not chain:
+            # Any render still queued or running is now stale
+            self.render_thread.cancel()
+            self.audio_data = self.original_audio_data
+            return
+        self.render_thread.request(self.original_audio_data, self.sample_rate, chain)
+
+    @pyqtSlot(int, object)
+    def on_rendered(self, generation, processed):
+        # Drop renders overtaken by a newer request, a cleared chain or a new file
+        if generation == self.render_thread.generation:
+            self.audio_data = processed
+
+    @pyqtSlot(int, str)
+    def on_render_failed(self, generation, err_msg):
+        if generation == self.render_thread.generation:
+            # Forget the failed chain so applying it again actually retries
+            self._last_applied = (None, None)
+            QMessageBox.critical(self, 'Effect Error', err_msg)
+
+
+class EffectRenderThread(QThread):
+    """Renders a track's effect chain off the GUI thread; only the latest request is kept."""
+    rendered = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+    def __init__(self):
+        super().__init__()
+        self._job = None
+        self._pending = None
+        # Bumped by every request and cancel; results are tagged with it
+        self.generation = 0
+        # Reused while the chain's effect types stay the same; only touched in run()
+        self._board = None
+        self._board_names = ()
+        self.finished.connect(self._start_pending)
+
+    def request(self, audio, sample_rate, chain):
+        self.generation += 1
+        self._pending = (self.generation, audio, sample_rate, chain)
+        if not self.isRunning():
+            self._start_pending()
+
+    def cancel(self):
+        """Drop the queued job and invalidate the one in flight."""
+        self.generation += 1
+        self._pending = None
+
+    @pyqtSlot()
+    def _start_pending(self):
+        if self._pending is None:
+            return
+        # finished arrives just before the thread exits, so let it fully stop first
+        self.wait()
+        self._job, self._pending = self._pending, None
+        self.start()
+
+    def run(self):
+        generation, audio, sample_rate, chain = self._job
+        try:
+            names = tuple(name for name, _ in chain)
+            if names != self._board_names:
+                self._board = Pedalboard([EFFECTS[name]['class'](**params) for name, params in chain])
+                self._board_names = names
+            else:
+                for plugin, (_, params) in zip(self._board, chain):
+                    for param, value in params.items():
+                        setattr(plugin, param, value)
+            # Pedalboard only reads its input, so the shared source needs no copy
+            processed = self._board(audio, sample_rate).astype(np.float32, copy=False)
+        except Exception as e:
+            # An uncaught error in run() aborts the whole app under PyQt6
+            self._board, self._board_names = None, ()
+            self.failed.emit(generation, str(e))
+            return
+        self.rendered.emit(generation, processed)
+
+class AudioLoader(QRunnable):
+    """Decodes one file on the global thread pool and reports back on the GUI thread."""
+
+    class Signals(QObject):
+        loaded = pyqtSignal(str, object, int)
+        failed = pyqtSignal(str, str)
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        # Created on the GUI thread, so the emits below arrive there queued
+        self.signals = AudioLoader.Signals()
+
+    def run(self):
+        try:
+            data, sr = read_audio(self.path)
+        except Exception as e:
+            self.signals.failed.emit(self.path, str(e))
+            return
+        self.signals.loaded.emit(self.path, data, sr)
 
 class SplitterThread(QThread):
+    """Hosts one asyncio event loop for the app's lifetime; splits are submitted to it."""
     finished = pyqtSignal(tuple)
+    stem_ready = pyqtSignal(int, str)
     error = pyqtSignal(str)
 
-    def __init__(self, path, method):
+    def __init__(self):
         super().__init__()
-        self.path = path
-        self.method = method
+        self.loop = asyncio.new_event_loop()
 
     def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        # Stopped by shutdown(); finish cancelled splits and close the loop on its own thread
+        pending = asyncio.all_tasks(self.loop)
+        for task in pending:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        self.loop.run_until_complete(self.loop.shutdown_default_executor())
+        self.loop.close()
+
+    def submit(self, path, method):
+        return asyncio.run_coroutine_threadsafe(self.split(path, method), self.loop)
+
+    def shutdown(self):
+        from splitter import shutdown_executors
+        shutdown_executors()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.wait()
+
+    async def split(self, path, method):
         try:
-            conv = convert_audio(self.path)
-            stems = asyncio.run(spleeter_split(conv)) if self.method == 'spleeter' else asyncio.run(demucs_split(conv))
+            # Imported on first split; splitter in turn only loads torch/demucs
+            # or spleeter once the chosen model is actually needed
+            from splitter import convert_audio, SPLITTERS
+            # Conversion is blocking file IO, so run it off the loop
+            conv = await self.loop.run_in_executor(None, convert_audio, path)
+            stems = await SPLITTERS[method](conv, on_stem=self.on_stem)
             self.finished.emit(stems)
         except Exception as e:
             self.error.emit(str(e))
 
+    def on_stem(self, index, path):
+        # Decode here so loading the stem on the GUI thread is a cache hit
+        read_audio(path)
+        self.stem_ready.emit(index, path)
+
 
 class AudioApp(QWidget):
     def __init__(self):
         super().__init__()
         self.tracks = []
         self.is_playing = False
+        self.stream = None
+        # Scratch block for the output callback, allocated once
+        self._scratch = _aligned((BLOCKSIZE, 2))
+        # Per-block gain ramp used to smooth volume changes
+        self._ramp = np.arange(1, BLOCKSIZE + 1, dtype=np.float32).reshape(-1, 1) / np.float32(BLOCKSIZE)
+        self._gain = _aligned((BLOCKSIZE, 1))
+        self._pending_seek = None
+        self._seek_frame = None
+        self._last_slider_px = -1
+        # Longest loaded track (frames) and its sample rate, refreshed on load
+        self._max_len = 1
+        self._has_audio = False
+        self._tracks_tuple = ()
+        self.splitter_thread = SplitterThread()
+        self._split_future = None
+        self.splitter_thread.stem_ready.connect(self.on_stem_ready)
+        self.splitter_thread.finished.connect(self.on_split_finished)
+        self.splitter_thread.error.connect(self.on_split_error)
+        self.splitter_thread.start()
         self.init_ui()
     def init_ui(self):
-        self.setStyleSheet("background-color: #202020; color: white;")
+        # Background and text colours come from the app-wide stylesheet
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(0, 0, 0, 10)
         main_layout.setSpacing(5)
@@ -377,11 +646,8 @@ class AudioApp(QWidget):
         reset_layout = QHBoxLayout()
         reset_layout.addStretch()
         self.reset_button = QPushButton('Reset')
+        self.reset_button.setObjectName('ResetButton')
         self.reset_button.setFont(btn_font)
-        self.reset_button.setStyleSheet(
-            "padding: 10px 20px; border-radius: 10px; "
-            "background-color: orange; color: black;"
-        )
         self.reset_button.clicked.connect(self.reset_all)
         reset_layout.addWidget(self.reset_button)
         reset_layout.addStretch()
@@ -422,8 +688,10 @@ class AudioApp(QWidget):
             brightness = (r * 299 + g * 587 + b * 114) / 1000
             text_color = 'black' if brightness > 128 else 'white'
             tr.setStyleSheet(f"background-color: {default_color}; color: {text_color};")
+            tr.length_changed.connect(self.on_track_length_changed)
             self.tracks.append(tr)
             tracks_layout.addWidget(tr)
+        self._tracks_tuple = tuple(self.tracks)
 
         main_layout.addLayout(tracks_layout, 1)
 
@@ -431,11 +699,14 @@ class AudioApp(QWidget):
         self.setWindowTitle('Remixer Demo')
         self.resize(1920, 1080)
 
+    @pyqtSlot()
     def toggle_play_stop(self):
         if not self.is_playing:
             for t in self.tracks:
                 t.position = 0
-                t.play()
+            # One stream mixes every track, so they always start on the same block
+            if self.open_stream() is not None:
+                self.stream.start()
             self.global_timer.start(100)
 
             self.play_button.setText('Stop')
@@ -443,48 +714,122 @@ class AudioApp(QWidget):
 
             self.is_playing = True
         else:
-            for t in self.tracks:
-                t.stop()
+            if self.stream is not None:
+                self.stream.stop()
             self.global_timer.stop()
+            # A seek the callback never consumed must not fire on the next Play
+            self._seek_frame = None
+            self._pending_seek = None
 
             self.play_button.setText('Play')
             self.play_button.setStyleSheet(self.btn_style.format('#008000'))
 
             self.is_playing = False
 
+    def open_stream(self):
+        """Open the shared output stream once loaded audio exists (reused across plays)."""
+        if not any(t.audio_data is not None for t in self.tracks):
+            return None
+        if self.stream is None:
+            # Every decode is normalised to PLAYBACK_RATE stereo, so one format fits all tracks
+            self.stream = sd.OutputStream(samplerate=PLAYBACK_RATE,
+                                          channels=2,
+                                          blocksize=BLOCKSIZE,
+                                          dtype='float32',
+                                          callback=self._mix_callback)
+        return self.stream
+
+    def _mix_callback(self, outdata, frames, time, status):
+        if status:
+            print(status)
+        scratch = self._scratch[:frames]
+        audible = False
+        # Immutable snapshot, so the list can change on the GUI thread mid-callback
+        tracks = self._tracks_tuple
+        seek = self._seek_frame
+        if seek is not None:
+            # Every track jumps at the top of the same block, so they stay sample-aligned
+            self._seek_frame = None
+            for t in tracks:
+                if t.audio_data is not None:
+                    t.position = min(seek, len(t.audio_data))
+        for t in tracks:
+            # Read once: the GUI thread may swap in a freshly rendered buffer at any time
+            data = t.audio_data
+            if data is None:
+                continue
+            start = t.position
+            n = min(frames, len(data) - start)
+            # Silenced tracks still advance so they stay in sync
+            t.position = start + n
+            if n <= 0 or t._mute_or_silenced:
+                continue
+            gain = t._volume
+            prev = t._applied_volume
+            if gain != prev:
+                # Glide to the new volume over one block instead of stepping (zipper noise)
+                ramp = self._gain[:n]
+                np.multiply(self._ramp[:n], gain - prev, out=ramp)
+                np.add(ramp, prev, out=ramp)
+                t._applied_volume = gain
+                gain = ramp
+            if not audible:
+                # The first audible track is scaled straight into the device buffer
+                np.multiply(data[start:start + n], gain, out=outdata[:n])
+                outdata[n:].fill(0)
+                audible = True
+            else:
+                np.multiply(data[start:start + n], gain, out=scratch[:n])
+                np.add(outdata[:n], scratch[:n], out=outdata[:n])
+        if not audible:
+            outdata.fill(0)
+
+    @pyqtSlot()
     def reset_all(self):
-        for t in self.tracks:
-            t.position = 0
-            t.update_time()
+        if self.stream is not None and self.stream.active:
+            # Same as a seek: the callback rewinds every track on one block
+            self._seek_frame = 0
+        else:
+            for t in self.tracks:
+                t.position = 0
+                t.update_time()
         self.global_slider.setValue(0)
+        self._last_slider_px = -1
 
-    def update_global_progress(self):
-        # figure out the furthest playback position and total length
-        max_pos = 0
-        max_len = 1
-        sample_rate = None
+    @pyqtSlot(int)
+    def on_track_length_changed(self, _length):
+        self._max_len, self._has_audio = 1, False
         for t in self.tracks:
-            if t.audio_data is None:
-                continue
-            length = len(t.audio_data)
-            if length > max_len:
-                max_len = length
-                sample_rate = t.sample_rate
-            if t.position > max_pos:
-                max_pos = t.position
+            if t.original_audio_data is not None:
+                self._has_audio = True
+                self._max_len = max(self._max_len, len(t.original_audio_data))
+
+    @pyqtSlot()
+    def update_global_progress(self):
+        # furthest playback position; the total length is kept up to date on load
+        max_pos = max(t.position for t in self._tracks_tuple)
+        max_len = self._max_len
+        # One app-wide timer refreshes every track's clock as well
+        for t in self._tracks_tuple:
+            t.update_time()
 
         # update slider
         val = int((max_pos / max_len) * 1000)
-        self.global_slider.blockSignals(True)
-        self.global_slider.setValue(val)
-        self.global_slider.blockSignals(False)
+        # Only touch the slider when the handle would actually move a pixel
+        px = val * self.global_slider.width() // 1000
+        # Never fight the user's drag; seek_all owns the handle until release
+        if px != self._last_slider_px and not self.global_slider.isSliderDown():
+            self._last_slider_px = px
+            # Display-only write: sliderMoved (the seek path) only fires for user drags
+            self.global_slider.setSliderPosition(val)
 
         # update time label
-        if sample_rate:
-            current_sec = max_pos / sample_rate
-            total_sec = max_len / sample_rate
+        if self._has_audio:
+            current_sec = max_pos / PLAYBACK_RATE
+            total_sec = max_len / PLAYBACK_RATE
             self.global_time_label.setText(f"{format_time(current_sec)} / {format_time(total_sec)}")
 
+    @pyqtSlot()
     def open_splitter_dialog(self):
         dialog = QDialog(self)
         dialog.setWindowTitle('Splitter')
@@ -493,7 +838,7 @@ class AudioApp(QWidget):
 
         file_edit = QLineEdit()
         browse = QPushButton('Browse')
-        browse.clicked.connect(lambda: file_edit.setText(QFileDialog.getOpenFileName(self, 'Select Audio', '', "Audio Files (*.wav *.mp3 *.flac)")[0]))
+        browse.clicked.connect(functools.partial(self.browse_split_file, file_edit))
         row = QHBoxLayout(); row.addWidget(file_edit); row.addWidget(browse)
         form.addRow('File', row)
 
@@ -502,11 +847,18 @@ class AudioApp(QWidget):
 
         layout.addLayout(form)
         go = QPushButton('Split')
-        go.clicked.connect(lambda: self.handle_split(dialog, file_edit.text(), method.currentText().lower()))
+        go.clicked.connect(functools.partial(self.on_split_clicked, dialog, file_edit, method))
         layout.addWidget(go)
         dialog.setLayout(layout)
         dialog.exec()
 
+    def browse_split_file(self, file_edit, _checked=False):
+        file_edit.setText(Track.ask_audio_file(self, 'Select Audio'))
+
+    def on_split_clicked(self, dialog, file_edit, method, _checked=False):
+        # Read the inputs at click time, not when the dialog was built
+        self.handle_split(dialog, file_edit.text(), method.currentText().lower())
+
     def handle_split(self, dialog, path, method):
         if not path:
             QMessageBox.warning(self, 'No File', 'Select a file first')
@@ -525,77 +877,88 @@ class AudioApp(QWidget):
         self.progress.show()
 
         # Background task
-        self.splitter_thread = SplitterThread(path, method)
-        self.splitter_thread.finished.connect(self.on_split_finished)
-        self.splitter_thread.error.connect(self.on_split_error)
-        self.splitter_thread.start()
+        self._split_future = self.splitter_thread.submit(path, method)
 
+    @pyqtSlot(int, str)
+    def on_stem_ready(self, index, path):
+        # Each stem is loaded as soon as it is decoded, while later ones are still in flight
+        if index < len(self.tracks):
+            self.tracks[index].load_audio(path)
+
+    @pyqtSlot(tuple)
     def on_split_finished(self, stems):
         self.progress.close()
-        for i, t in enumerate(self.tracks[:4]):
-            t.load_audio(stems[i])
         QMessageBox.information(self, 'Done', 'Splitting complete!')
-        self.splitter_thread = None
 
+    @pyqtSlot(str)
     def on_split_error(self, err_msg):
         self.progress.close()
         QMessageBox.critical(self, 'Error', err_msg)
-        self.splitter_thread = None
 
-    def seek_all(self, value):
-        was_playing = self.is_playing
-
-        if was_playing:
-            for t in self.tracks:
-                t.stop()
-            self.global_timer.stop()
-            self.play_button.setText('Play')
-            self.is_playing = False
-
-        max_len = 1
-        for t in self.tracks:
-            if t.audio_data is not None:
-                max_len = max(max_len, len(t.audio_data))
-        target = int((value / 1000) * max_len)
+    def closeEvent(self, event):
+        if self._split_future is not None:
+            self._split_future.cancel()
+        self.splitter_thread.shutdown()
+        super().closeEvent(event)
 
+    @pyqtSlot(int)
+    def seek_all(self, value):
+        # Coalesce a burst of sliderMoved events into one seek once Qt is idle
+        if self._pending_seek is None:
+            QTimer.singleShot(0, self.apply_pending_seek)
+        self._pending_seek = value
+
+    @pyqtSlot()
+    def apply_pending_seek(self):
+        value, self._pending_seek = self._pending_seek, None
+        if value is None:
+            # Dropped by a stop before Qt got around to it
+            return
+        # The user moved the handle, so the next progress tick must redraw it
+        self._last_slider_px = -1
+        # The mix callback reads each track's position, so seeking just moves it
+        # and the running stream carries on without being torn down
+        target = int((value / 1000) * self._max_len)
+
+        if self.is_playing and self.stream is not None and self.stream.active:
+            # Hand the seek to the audio thread instead of moving tracks one by one
+            # while blocks are being mixed; the progress timer picks up the new clocks
+            self._seek_frame = target
+            return
         for t in self.tracks:
             if t.audio_data is not None:
                 t.position = min(target, len(t.audio_data))
                 t.update_time()
 
-        # 5) If we were playing, restart playback and timer
-        if was_playing:
-            for t in self.tracks:
-                t.play()
-            self.global_timer.start(100)
-            self.play_button.setText('Stop')
-
-            self.is_playing = True
-
+    @pyqtSlot()
     def export_tracks(self):
-        mixed, sr = None, None
-        for t in self.tracks:
-            if t.audio_data is None: continue
-            data = t.audio_data.copy() * (t.volume_slider.value()/100)
-            if mixed is None:
-                mixed, sr = data, t.sample_rate
-            else:
-                maxlen = max(mixed.shape[0], data.shape[0])
-                pad1 = np.zeros((maxlen-mixed.shape[0], mixed.shape[1]))
-                pad2 = np.zeros((maxlen-data.shape[0], data.shape[1]))
-                mixed = np.vstack((mixed,pad1)) + np.vstack((data,pad2))
-        if mixed is None:
+        loaded = [t for t in self.tracks if t.audio_data is not None]
+        if not loaded:
             QMessageBox.warning(self, 'No Tracks', 'Load at least one track')
             return
-        mx = np.max(np.abs(mixed))
-        if mx>1: mixed/=mx
+        maxlen = max(len(t.audio_data) for t in loaded)
+        # Accumulate in place into one buffer; shorter tracks just cover a prefix
+        mixed = _aligned((maxlen, 2))
+        mixed.fill(0)
+        scratch = _aligned((maxlen, 2))
+        for t in loaded:
+            n = len(t.audio_data)
+            np.multiply(t.audio_data, t._volume, out=scratch[:n])
+            np.add(mixed[:n], scratch[:n], out=mixed[:n])
+        # Peak from two read-only reductions; no abs() pass writing a full buffer
+        mx = max(mixed.max(), -mixed.min())
+        if mx>1: np.multiply(mixed, 1.0/mx, out=mixed)
         save,_ = QFileDialog.getSaveFileName(self, 'Save Mix', '', "WAV (*.wav)")
         if save:
-            sf.write(save, mixed, sr)
+            sf.write(save, mixed, PLAYBACK_RATE)
             QMessageBox.information(self, 'Done', f'Saved to {save}')
 
 if __name__ == '__main__':
+    # Merge bursts of mouse-move events so slider drags don't queue up
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_CompressHighFrequencyEvents)
     app = QApplication(sys.argv)
+    # One app-wide default font, set before any widget needs its metrics
+    app.setFont(QFont("Roboto", 10))
     app.setStyleSheet(
         "QWidget { color: white; background-color: #202020; }\n"
         "QSlider::groove:horizontal { background: #404040; height: 8px; border-radius: 4px; }\n"
@@ -603,6 +966,7 @@ if __name__ == '__main__':
         "QSlider::add-page:horizontal { background: #505050; border-radius: 4px; }\n"
         "QSlider::handle:horizontal { background: #A0A0A0; width: 12px; margin: -2px 0; border-radius: 6px; }\n"
         "QPushButton { background: #404040; color: white; }\n"
+        "QPushButton#ResetButton { padding: 10px 20px; border-radius: 10px; background-color: orange; color: black; }\n"
         "QComboBox, QLineEdit { background: #303030; color: white; }"
     )
     w = AudioApp()
@@ -38,12 +38,16 @@ async def split_all(directory):
 
     for item in filenames:
         print(f"Running split operation on {item}")
-        await demucs_split(os.path.join(directory, item))
-        print(f"{item} finished!\n")
+        stems = await demucs_split(os.path.join(directory, item))
+        # Stems live in the content-addressed cache, so say where they ended up
+        print(f"{item} finished! Stems in {os.path.dirname(stems[0])}:")
+        for path in stems:
+            print(f"  {path}")
+        print("")
 
 
 async def main():
-    directory = "C:/Users/Atlas/Music/Splitter Project/"
+    directory = input("Enter the folder of audio files to split: ").strip()
     print("Starting split")
     await split_all(directory)
     print("")
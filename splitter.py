@@ -1,15 +1,13 @@
 import asyncio
+import concurrent.futures
+import functools
 import os
 import subprocess
-from pydub import AudioSegment
 
-import torch
-from demucs import pretrained
-from demucs.apply import apply_model
-import torchaudio
-from spleeter.separator import Separator
+import numpy as np
+import soundfile as sf
 
-from utils import cache_file, get_cache_dir
+from utils import cache_file, get_cache_dir, get_stem_cache_dir, source_key
 
 def convert_audio(file_path: str) -> str:
     """Checks if a file is a .wav or .mp3, the only supported file formats from Demucs and Spleeter"""
@@ -20,68 +18,190 @@ def convert_audio(file_path: str) -> str:
     else:
         cache_dir = get_cache_dir()
         # Save converted file into the cache folder.
-        cached_file = os.path.join(cache_dir, os.path.splitext(os.path.basename(file_path))[0] + ".wav")
+        cached_file = os.path.join(cache_dir, source_key(file_path) + ".wav")
         if not os.path.exists(cached_file):
             print(f"Converting {file_path} to WAV format...")
-            audio = AudioSegment.from_file(file_path)
-            audio.export(cached_file, format="wav")
+            # ffmpeg streams the decode natively instead of building the PCM up in Python;
+            # written under a temp name so an interrupted run never leaves a partial cache hit
+            tmp_file = cached_file + ".part.wav"
+            result = subprocess.run(
+                ["ffmpeg", "-nostdin", "-nostats", "-loglevel", "error", "-y", "-threads", "0", "-i", file_path,
+                 "-c:a", "pcm_s16le", "-ar", "44100", "-ac", "2", tmp_file],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg failed:\n{result.stderr.decode(errors='replace')}")
+            os.replace(tmp_file, cached_file)
         return cached_file
 
 
-async def spleeter_split(file_path: str, output_dir: str = None) -> tuple:
-    """Splits a song into stems using Spleeter and caches the result."""
-    from utils import get_cache_dir
-    if output_dir is None:
-        output_dir = os.path.join(get_cache_dir(), "Spleeter_Output")
-    os.makedirs(output_dir, exist_ok=True)
-
-    base_name = os.path.splitext(os.path.basename(file_path))[0]
-    track_folder = os.path.join(output_dir, base_name)
+# Spleeter's pretrained models work on 44.1 kHz audio
+SPLEETER_RATE = 44100
+
+# One worker each: the models are not thread-safe, and long splits
+# shouldn't tie up the loop's default executor used for file IO
+_SPLEETER_EXEC = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="spleeter")
+_DEMUCS_EXEC = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="demucs")
+
+
+def shutdown_executors():
+    """Drop queued model runs so exiting only waits for a split already in progress."""
+    for executor in (_SPLEETER_EXEC, _DEMUCS_EXEC):
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_separator():
+    """Build the Spleeter separator once; its TensorFlow graph and weights are reused by every split."""
+    # Imported on first use: TensorFlow is slow to load and most runs only need one splitter
+    from spleeter.separator import Separator
+    return Separator("spleeter:4stems")
+
+
+def _cached_stems(stem_folder: str, names: tuple):
+    """Return the cached stem paths if every stem is present, else None (one directory scan)."""
+    try:
+        with os.scandir(stem_folder) as it:
+            present = {entry.name for entry in it}
+    except FileNotFoundError:
+        return None
+    if not present.issuperset(names):
+        return None
+    return tuple(os.path.join(stem_folder, n) for n in names)
+
+
+def _report_stems(stems: tuple, on_stem=None) -> tuple:
+    """Call on_stem(index, path) for each finished stem, then return the stems."""
+    if on_stem is not None:
+        for index, path in enumerate(stems):
+            on_stem(index, path)
+    return stems
+
+
+def _load_spleeter_input(file_path: str) -> np.ndarray:
+    """Decode file_path as the (frames, 2) float32 array at 44.1 kHz that Spleeter's model takes."""
+    waveform = None
+    try:
+        with sf.SoundFile(file_path) as f:
+            if f.samplerate == SPLEETER_RATE:
+                # Read straight into one preallocated buffer instead of through AudioAdapter's copies
+                waveform = np.empty((f.frames, f.channels), dtype=np.float32)
+                # read() returns a prefix view if the decoder yields fewer frames
+                waveform = f.read(out=waveform)
+    except RuntimeError:
+        # Format libsndfile can't open (e.g. MP3 on older builds)
+        pass
+    if waveform is None:
+        # Other rates need resampling, which AudioAdapter does through ffmpeg
+        from spleeter.audio.adapter import AudioAdapter
+        waveform, _ = AudioAdapter.default().load(file_path, sample_rate=SPLEETER_RATE)
+    if waveform.shape[1] == 1:
+        waveform = np.repeat(waveform, 2, axis=1)
+    return waveform
+
+
+def _run_spleeter(file_path: str, stem_folder: str, stem_files: tuple) -> tuple:
+    """Separate file_path with the cached Spleeter model and write the stems into stem_folder."""
+    waveform = _load_spleeter_input(file_path)
+    prediction = _get_separator().separate(waveform)
+    os.makedirs(stem_folder, exist_ok=True)
+    paths = []
+    for stem_file in stem_files:
+        path = os.path.join(stem_folder, stem_file)
+        sf.write(path, prediction[os.path.splitext(stem_file)[0]], SPLEETER_RATE, subtype="PCM_16")
+        paths.append(path)
+    return tuple(paths)
+
+
+async def spleeter_split(file_path: str, on_stem=None) -> tuple:
+    """Splits a song into stems using Spleeter and caches the result.
+    on_stem(index, path) is called as each stem becomes available."""
+    stem_folder = get_stem_cache_dir(file_path, "spleeter")
     expected_tracks = ("vocals.wav", "drums.wav", "bass.wav", "other.wav")
 
     #Check if exists
-    if os.path.isdir(track_folder) and all(os.path.exists(os.path.join(track_folder, t)) for t in expected_tracks):
-        print(f"Cache hit: Using previously split files from {track_folder}")
-        return tuple(os.path.join(track_folder, t) for t in expected_tracks)
+    cached = _cached_stems(stem_folder, expected_tracks)
+    if cached is not None:
+        print(f"Cache hit: Using previously split files from {stem_folder}")
+        return _report_stems(cached, on_stem)
 
     #Was not in cache; start actually splitting
     print("Cache miss: Running Spleeter splitting process...")
-    separator = Separator("spleeter:4stems")
-    loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, separator.separate_to_file, file_path, output_dir)
-
-    return tuple(os.path.join(track_folder, t) for t in expected_tracks)
-
-
-async def demucs_split(file_path: str, output_dir: str = None) -> tuple:
-    """Splits a song into stems using Demucs and caches the result."""
-    if output_dir is None:
-        output_dir = os.path.join(get_cache_dir(), "Demucs_Output")
-    os.makedirs(output_dir, exist_ok=True)
-
-    base_name = os.path.splitext(os.path.basename(file_path))[0]
-    song_output_folder = os.path.join(output_dir, "htdemucs", base_name)
+    loop = asyncio.get_running_loop()
+    stems = await loop.run_in_executor(_SPLEETER_EXEC, _run_spleeter, file_path, stem_folder, expected_tracks)
+    return _report_stems(stems, on_stem)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_demucs_model():
+    """Load the htdemucs model once onto the fastest available device and keep it ready."""
+    import torch
+    from demucs import pretrained
+    if torch.cuda.is_available():
+        device = "cuda"
+    elif torch.backends.mps.is_available():
+        device = "mps"
+    else:
+        device = "cpu"
+    model = pretrained.get_model("htdemucs")
+    model.to(device)
+    model.eval()
+    return model, device
+
+
+def _run_demucs(file_path: str, stem_folder: str, stem_files: tuple) -> tuple:
+    """Separate file_path with the cached Demucs model and write the stems into stem_folder."""
+    import torch
+    import torchaudio
+    from demucs.apply import apply_model
+    from demucs.audio import convert_audio as demucs_convert_audio
+    model, device = _get_demucs_model()
+    wav, sr = torchaudio.load(file_path)
+    # Resample and up/down-mix to the model's layout exactly as the CLI does
+    wav = demucs_convert_audio(wav, sr, model.samplerate, model.audio_channels)
+    # Same normalisation the demucs CLI applies before separating
+    ref = wav.mean(0)
+    mean, std = ref.mean(), ref.std()
+    wav = (wav - mean) / std
+    with torch.inference_mode():
+        sources = apply_model(model, wav[None].to(device), split=True, overlap=0.25, progress=False)[0]
+    sources = sources.cpu() * std + mean
+
+    os.makedirs(stem_folder, exist_ok=True)
+    by_name = dict(zip(model.sources, sources))
+    paths = []
+    for stem_file in stem_files:
+        path = os.path.join(stem_folder, stem_file)
+        # 16-bit PCM like the CLI's default output
+        torchaudio.save(path, by_name[os.path.splitext(stem_file)[0]].clamp(-1, 1), model.samplerate,
+                        encoding="PCM_S", bits_per_sample=16)
+        paths.append(path)
+    return tuple(paths)
+
+
+async def demucs_split(file_path: str, on_stem=None) -> tuple:
+    """Splits a song into stems using Demucs and caches the result.
+    on_stem(index, path) is called as each stem becomes available."""
+    stem_folder = get_stem_cache_dir(file_path, "demucs")
     stem_files = ("bass.wav", "drums.wav", "other.wav", "vocals.wav")
 
-    # Check if the output folder exists with all required stem files.
-    if os.path.isdir(song_output_folder) and all(
-            os.path.exists(os.path.join(song_output_folder, s)) for s in stem_files):
-        print(f"Cache hit: Using previously split files from {song_output_folder}")
-        return tuple(os.path.join(song_output_folder, s) for s in stem_files)
+    # Check if this exact audio has already been split with Demucs.
+    cached = _cached_stems(stem_folder, stem_files)
+    if cached is not None:
+        print(f"Cache hit: Using previously split files from {stem_folder}")
+        return _report_stems(cached, on_stem)
 
-    # Otherwise, perform the Demucs splitting.
+    # Otherwise, separate in-process; the model stays loaded between splits
     print("Cache miss: Running Demucs splitting process...")
-    process = await asyncio.create_subprocess_exec(
-        "demucs", "--out", output_dir, file_path,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await process.communicate()
-    if process.returncode != 0:
-        raise RuntimeError(f"Demucs failed:\n{stderr.decode()}")
-
-    # Return the new expected path
-    return tuple(os.path.join(song_output_folder, s) for s in stem_files)
+    loop = asyncio.get_running_loop()
+    stems = await loop.run_in_executor(_DEMUCS_EXEC, _run_demucs, file_path, stem_folder, stem_files)
+    return _report_stems(stems, on_stem)
+
+# Available separation methods, keyed by the lowercase name shown in the UI
+SPLITTERS = {
+    "demucs": demucs_split,
+    "spleeter": spleeter_split,
+}
 
 # JUST FOR DEBUGGING BELOW
 async def main():
@@ -90,13 +210,10 @@ async def main():
 
     converted_file = convert_audio(file_path)
     print("File ready")
-    if method == "spleeter":
-        stems = await spleeter_split(converted_file)
-    elif method == "demucs":
-        stems = await demucs_split(converted_file)
-    else:
+    if method not in SPLITTERS:
         print("Invalid method chosen.")
         return
+    stems = await SPLITTERS[method](converted_file)
 
     print("Separated stem files:")
     for path in stems:
@@ -104,6 +221,3 @@ async def main():
 
 if __name__ == "__main__":
     asyncio.run(main())
-
-
-#C:/Users/Atlas/Music/converted_audio.wav
\ No newline at end of file
@@ -1,4 +1,5 @@
 # utils.py
+import hashlib
 import os
 import platform
 import shutil
@@ -16,12 +17,33 @@ def get_cache_dir():
     os.makedirs(cache_dir, exist_ok=True)
     return cache_dir
 
+def source_key(file_path: str) -> str:
+    """Return a short cache key for a source file from its absolute path, size and mtime."""
+    st = os.stat(file_path)
+    ident = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.blake2b(ident.encode(), digest_size=16).hexdigest()
+
 def cache_file(file_path: str) -> str:
-    """Copy the file into the OS-specific cache folder (if not already there) and return the cached path."""
+    """Link (or copy) the file into the OS-specific cache folder (if not already there) and return the cached path."""
     cache_dir = get_cache_dir()
-    base_name = os.path.basename(file_path)
-    cached_file = os.path.join(cache_dir, base_name)
-    # Copy if file is not already cached.
+    # Keyed on the source identity, so same-named files from different folders don't collide
+    cached_file = os.path.join(cache_dir, source_key(file_path) + os.path.splitext(file_path)[1].lower())
     if not os.path.exists(cached_file):
-        shutil.copy2(file_path, cached_file)
+        try:
+            os.link(file_path, cached_file)
+        except OSError:
+            # Different filesystem or no hard link support
+            shutil.copy2(file_path, cached_file)
     return cached_file
+
+def file_digest(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file, hashed in chunks so large files aren't read whole."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def get_stem_cache_dir(file_path: str, method: str) -> str:
+    """Return the folder holding the stems of this exact audio content for a split method."""
+    return os.path.join(get_cache_dir(), "Stems", f"{file_digest(file_path)}_{method}")